@@ -1,30 +1,78 @@
-import json
-from datetime import datetime, timezone
+import os
+import time
+from collections.abc import Callable
+from functools import cache, wraps
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
+from ollama_pod import runpod_api
 from ollama_pod.gpu import CloudType, find_cheapest_gpu
 from ollama_pod.model_info import estimate_vram_gb
 from ollama_pod.pod import (
-    CLOUD_TYPE_MAP,
+    CREATE_ATTEMPTS,
+    DEFAULT_NUM_PARALLEL,
     OLLAMA_IMAGE,
+    PodError,
+    PodTimeoutError,
     create_ollama_pod,
     find_ollama_pods,
     get_endpoint,
+    normalize_cloud_type,
     pull_model,
     resolve_volume_datacenter,
     terminate_pod,
+    terminate_pods_sync,
     wait_for_ready,
 )
+from ollama_pod.runpod_api import AuthError
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 app = typer.Typer(help="Spin up/down Ollama on RunPod GPUs.")
-console = Console()
+
+try:
+    import orjson
+
+    def _dumps(obj: dict) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    import json
+
+    def _dumps(obj: dict) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    _loads = json.loads
 
 STATE_DIR = Path.home() / ".ollama-pod"
 PODS_DIR = STATE_DIR / "pods"
+MAX_STATE_READERS = 8
+MAX_STATUS_FETCHERS = 8
+
+
+@cache
+def _console() -> "Console":
+    """Return the shared Rich console (rich is imported on first use, not at startup)."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _exit_on_auth_error(command: Callable) -> Callable:
+    """Turn runpod_api.AuthError into a plain CLI exit with the key hint."""
+
+    @wraps(command)
+    def wrapper(*args, **kwargs):
+        try:
+            return command(*args, **kwargs)
+        except AuthError as e:
+            raise SystemExit(str(e)) from e
+
+    return wrapper
 
 
 def _pod_file(name: str) -> Path:
@@ -34,26 +82,45 @@ def _pod_file(name: str) -> Path:
 def _save_state(name: str, state: dict) -> None:
     PODS_DIR.mkdir(parents=True, exist_ok=True)
     state["name"] = name
-    _pod_file(name).write_text(json.dumps(state, indent=2))
+    path = _pod_file(name)
+    # Write a sibling temp file and rename it into place: the rename is atomic,
+    # so an interrupted write can't leave a truncated state file behind.
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(_dumps(state))
+    tmp.replace(path)
 
 
 def _load_state(name: str) -> dict | None:
-    path = _pod_file(name)
-    if not path.exists():
+    try:
+        return _loads(_pod_file(name).read_bytes())
+    except FileNotFoundError:
         return None
-    return json.loads(path.read_text())
+
+
+def _read_state_file(path: str) -> dict:
+    return _loads(Path(path).read_bytes())
 
 
 def _load_all_states() -> list[dict]:
-    if not PODS_DIR.exists():
+    try:
+        with os.scandir(PODS_DIR) as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".json") and e.is_file()),
+                key=lambda e: e.name,
+            )
+    except FileNotFoundError:
         return []
-    return [json.loads(f.read_text()) for f in sorted(PODS_DIR.glob("*.json"))]
+    if len(entries) <= 1:
+        return [_read_state_file(e.path) for e in entries]
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Overlap the reads; this matters on slow home directories (NFS, encrypted FS)
+    with ThreadPoolExecutor(max_workers=min(MAX_STATE_READERS, len(entries))) as ex:
+        return list(ex.map(_read_state_file, (e.path for e in entries)))
 
 
 def _clear_state(name: str) -> None:
-    path = _pod_file(name)
-    if path.exists():
-        path.unlink()
+    _pod_file(name).unlink(missing_ok=True)
 
 
 def _sync_from_runpod() -> list[dict]:
@@ -91,6 +158,7 @@ def _sync_from_runpod() -> list[dict]:
 
 
 @app.command()
+@_exit_on_auth_error
 def up(
     model: str = typer.Argument(help="Ollama model to pull (e.g. qwen2.5:7b)"),
     name: str = typer.Option("default", help="Name for this pod (used for multi-pod tracking)"),
@@ -100,8 +168,19 @@ def up(
     cloud_type: CloudType = typer.Option("any", help="Cloud type: any, community, or secure"),
     image: str | None = typer.Option(None, help=f"Docker image (default: {OLLAMA_IMAGE})"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show GPU and cost without creating a pod"),
+    num_parallel: int = typer.Option(
+        DEFAULT_NUM_PARALLEL, min=1, help="Requests Ollama serves in parallel (OLLAMA_NUM_PARALLEL)"
+    ),
+    env: list[str] | None = typer.Option(
+        None, "--env", help="Container env var as KEY=VALUE (repeatable), e.g. OLLAMA_NUM_PARALLEL=4"
+    ),
 ) -> None:
     """Spin up an Ollama pod on RunPod and pull a model."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
+    console = _console()
+    pod_env = _parse_env(env or [])
+
     # Check for existing active pod with this name
     existing = _load_state(name)
     if existing:
@@ -112,82 +191,121 @@ def up(
         )
         raise typer.Exit(1)
 
-    # Resolve VRAM requirement
-    if vram is None:
-        with console.status(f"Querying model size for [bold]{model}[/bold]..."):
+    # One transient Live display for the whole pipeline; console.print output
+    # is rendered above it while it runs.
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TextColumn("{task.fields[size]}"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("", total=None, size="")
+
+        def _step(description: str) -> None:
+            progress.update(task, description=description, total=None, completed=0, size="")
+
+        # Resolve VRAM requirement
+        if vram is None:
+            _step(f"Querying model size for [bold]{model}[/bold]...")
             min_vram = estimate_vram_gb(model)
-        console.print(f"Estimated VRAM needed: {min_vram:.1f} GB")
-    else:
-        min_vram = vram
-
-    # Resolve datacenter when volume is specified
-    datacenter_id: str | None = None
-    if volume_id:
-        with console.status("Looking up volume datacenter..."):
-            datacenter_id = resolve_volume_datacenter(volume_id)
-        if datacenter_id:
-            console.print(f"Volume [bold]{volume_id}[/bold] pinned to datacenter [bold]{datacenter_id}[/bold]")
+            console.print(f"Estimated VRAM needed: {min_vram:.1f} GB")
         else:
-            console.print(f"[yellow]Warning: could not resolve datacenter for volume {volume_id}[/yellow]")
+            min_vram = vram
 
-    # Find GPU
-    if gpu_type is None:
-        with console.status("Finding cheapest available GPU..."):
+        # Resolve datacenter when volume is specified
+        datacenter_id: str | None = None
+        if volume_id:
+            _step("Looking up volume datacenter...")
+            datacenter_id = resolve_volume_datacenter(volume_id)
+            if datacenter_id:
+                console.print(f"Volume [bold]{volume_id}[/bold] pinned to datacenter [bold]{datacenter_id}[/bold]")
+            else:
+                console.print(f"[yellow]Warning: could not resolve datacenter for volume {volume_id}[/yellow]")
+
+        # Find GPU
+        if gpu_type is None:
+            _step("Finding cheapest available GPU...")
             gpu_type, cost_per_hr, resolved_cloud = find_cheapest_gpu(min_vram, cloud_type)
-        console.print(
-            f"Selected GPU: [bold]{gpu_type}[/bold] (${cost_per_hr:.2f}/hr, {resolved_cloud} cloud)"
-        )
-        if datacenter_id and cloud_type != "any":
             console.print(
-                f"[yellow]Note: GPU availability is based on global data. "
-                f"{gpu_type} may not be available as {resolved_cloud} cloud "
-                f"in datacenter {datacenter_id}. Deployment will fail fast if so.[/yellow]"
+                f"Selected GPU: [bold]{gpu_type}[/bold] (${cost_per_hr:.2f}/hr, {resolved_cloud} cloud)"
             )
-    else:
-        cost_per_hr = 0.0  # unknown when manually specified
-        resolved_cloud = cloud_type
-
-    if dry_run:
-        console.print("\n[bold]Dry run summary:[/bold]")
-        console.print(f"  Model: {model}")
-        console.print(f"  Image: {image or OLLAMA_IMAGE}")
-        console.print(f"  Name:  {name}")
-        console.print(f"  VRAM:  {min_vram:.1f} GB")
-        console.print(f"  GPU:   {gpu_type}")
-        if cost_per_hr > 0:
-            console.print(f"  Cost:  ${cost_per_hr:.2f}/hr")
-        raise typer.Exit(0)
-
-    # Create pod
-    with console.status("Creating pod..."):
-        pod_id = create_ollama_pod(
-            gpu_type,
-            name=name,
-            network_volume_id=volume_id,
-            cloud_type=CLOUD_TYPE_MAP[cloud_type],
-            image=image,
-        )
-    console.print(f"Pod created: [bold]{pod_id}[/bold]")
+            if datacenter_id and cloud_type != "any":
+                console.print(
+                    f"[yellow]Note: GPU availability is based on global data. "
+                    f"{gpu_type} may not be available as {resolved_cloud} cloud "
+                    f"in datacenter {datacenter_id}. Deployment will fail fast if so.[/yellow]"
+                )
+        else:
+            cost_per_hr = 0.0  # unknown when manually specified
+            resolved_cloud = cloud_type
+
+        if dry_run:
+            progress.stop()
+            console.print("\n[bold]Dry run summary:[/bold]")
+            console.print(f"  Model: {model}")
+            console.print(f"  Image: {image or OLLAMA_IMAGE}")
+            console.print(f"  Name:  {name}")
+            console.print(f"  VRAM:  {min_vram:.1f} GB")
+            console.print(f"  GPU:   {gpu_type}")
+            if cost_per_hr > 0:
+                console.print(f"  Cost:  ${cost_per_hr:.2f}/hr")
+            raise typer.Exit(0)
 
-    # Wait for ready
-    try:
-        with console.status("Waiting for pod to be ready..."):
-            pod_info = wait_for_ready(pod_id)
-    except SystemExit:
-        console.print("[red]Pod failed to start. Terminating...[/red]")
-        terminate_pod(pod_id)
-        raise
+        # Create pod
+        _step("Creating pod...")
 
-    endpoint = get_endpoint(pod_info)
+        def _on_retry(attempt: int, delay: float) -> None:
+            console.print(
+                f"[yellow]No capacity, retrying in {delay:.0f}s "
+                f"(attempt {attempt}/{CREATE_ATTEMPTS})[/yellow]"
+            )
 
-    # Pull model
-    try:
-        with console.status(f"Pulling [bold]{model}[/bold] (may take a few minutes)..."):
-            pull_model(endpoint, model)
-    except Exception as e:
-        console.print(f"[red]Model pull failed: {e}. Terminating pod...[/red]")
-        terminate_pod(pod_id)
-        raise typer.Exit(1)
+        try:
+            pod_id = create_ollama_pod(
+                gpu_type,
+                name=name,
+                network_volume_id=volume_id,
+                cloud_type=normalize_cloud_type(cloud_type),
+                image=image,
+                data_center_id=datacenter_id,
+                env=pod_env,
+                num_parallel=num_parallel,
+                on_retry=_on_retry,
+            )
+        except PodError as e:
+            raise SystemExit(str(e)) from e
+        console.print(f"Pod created: [bold]{pod_id}[/bold]")
+
+        # Wait for ready
+        try:
+            _step("Waiting for pod to be ready...")
+            pod_info = wait_for_ready(pod_id)
+        except PodTimeoutError as e:
+            console.print("[red]Pod failed to start. Terminating...[/red]")
+            terminate_pod(pod_id)
+            raise SystemExit(str(e)) from e
+
+        endpoint = get_endpoint(pod_info)
+
+        # Pull model
+        def _on_progress(event: dict) -> None:
+            description = f"Pulling [bold]{model}[/bold]: {event.get('status', '')}"
+            if event.get("total"):
+                total, completed = event["total"], event.get("completed", 0)
+                size = f"{completed / 1024**3:.1f}/{total / 1024**3:.1f} GB"
+                progress.update(task, description=description, total=total, completed=completed, size=size)
+            else:
+                progress.update(task, description=description)
+
+        try:
+            _step(f"Pulling [bold]{model}[/bold] (may take a few minutes)...")
+            pull_model(endpoint, model, on_progress=_on_progress)
+        except Exception as e:
+            console.print(f"[red]Model pull failed: {e}. Terminating pod...[/red]")
+            terminate_pod(pod_id)
+            raise typer.Exit(1)
 
     # Save state
     state = {
@@ -197,7 +315,7 @@ def up(
         "gpu_type": gpu_type,
         "cost_per_hr": cost_per_hr,
         "network_volume_id": volume_id,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": time.time(),
     }
     _save_state(name, state)
 
@@ -211,11 +329,29 @@ def up(
         console.print(f"  Cost:     ${cost_per_hr:.2f}/hr")
 
 
+def _parse_env(pairs: list[str]) -> dict[str, str]:
+    """Parse repeated --env KEY=VALUE options into a dict."""
+    env = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise typer.BadParameter(f"expected KEY=VALUE, got {pair!r}", param_hint="--env")
+        env[key] = value
+    return env
+
+
 @app.command()
+@_exit_on_auth_error
 def down(
     name: str = typer.Option("default", help="Name of the pod to terminate"),
+    all_pods: bool = typer.Option(False, "--all", help="Terminate every tracked pod"),
 ) -> None:
     """Terminate a tracked Ollama pod."""
+    console = _console()
+    if all_pods:
+        _down_all()
+        return
+
     state = _load_state(name)
     if state is None:
         existing = _load_all_states()
@@ -236,24 +372,42 @@ def down(
         console.print("Network volume preserved — models cached for next run.")
 
 
+def _down_all() -> None:
+    """Terminate all tracked pods concurrently and clear state for those that went."""
+    console = _console()
+    states = _load_all_states()
+    if not states:
+        console.print("No tracked pods found.")
+        raise typer.Exit(1)
+
+    with console.status(f"Terminating {len(states)} pod(s)..."):
+        errors = terminate_pods_sync([s["pod_id"] for s in states])
+
+    for state in states:
+        pod_name, pod_id = state.get("name", "?"), state["pod_id"]
+        if pod_id in errors:
+            console.print(f"[red]Failed to terminate pod '{pod_name}' ({pod_id}): {errors[pod_id]}[/red]")
+        else:
+            _clear_state(pod_name)
+            console.print(f"[green]Pod '{pod_name}' ({pod_id}) terminated.[/green]")
+    if errors:
+        raise typer.Exit(1)
+
+
 @app.command()
+@_exit_on_auth_error
 def status(
     name: str | None = typer.Option(None, help="Name of a specific pod to show"),
 ) -> None:
     """Show the status of tracked Ollama pods."""
-    import runpod
-
-    from ollama_pod.config import runpod_api_key
-
-    runpod.api_key = runpod_api_key()
-
+    console = _console()
     if name is not None:
         # Show a single named pod
         state = _load_state(name)
         if state is None:
             console.print(f"No pod named '{name}'.")
             raise typer.Exit(1)
-        _print_pod_table(runpod, state)
+        _show_pods([state])
         return
 
     # Show all tracked pods
@@ -269,24 +423,59 @@ def status(
         console.print()
         states = synced
 
-    for state in states:
-        _print_pod_table(runpod, state)
-        console.print()
+    _show_pods(states, separate=True)
 
 
-def _print_pod_table(runpod_mod, state: dict) -> None:  # noqa: ANN001
-    """Print a Rich table for a single pod state."""
-    pod_name = state.get("name", "?")
+def _fetch_pod(state: dict) -> dict | None:
+    """Return the live RunPod record for a tracked pod, or None if it can't be found."""
     try:
-        pod = runpod_mod.get_pod(state["pod_id"])
-        if pod is None:
-            raise LookupError
+        return runpod_api.get_pod(state["pod_id"])
+    except AuthError:
+        raise
     except Exception:
-        console.print(f"[yellow]Pod '{pod_name}' ({state['pod_id']}) not found on RunPod. Cleaning up.[/yellow]")
-        _clear_state(pod_name)
-        return
+        return None
+
+
+def _show_pods(states: list[dict], *, separate: bool = False) -> None:
+    """Look up tracked pods on RunPod and print a table for each.
+
+    Lookups run concurrently when there are several pods. Pods RunPod no longer
+    knows about are reported and their local state is removed.
+    """
+    console = _console()
+    if len(states) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(MAX_STATUS_FETCHERS, len(states))) as ex:
+            pods = list(ex.map(_fetch_pod, states))
+    else:
+        pods = [_fetch_pod(state) for state in states]
 
-    table = Table(title=f"Pod: {pod_name}")
+    for state, pod in zip(states, pods):
+        if pod is None:
+            pod_name = state.get("name", "?")
+            console.print(f"[yellow]Pod '{pod_name}' ({state['pod_id']}) not found on RunPod. Cleaning up.[/yellow]")
+            _clear_state(pod_name)
+        else:
+            _print_pod_table(state, pod)
+        if separate:
+            console.print()
+
+
+def _format_created(created_at: float | str) -> str:
+    """Render a state's created_at: epoch seconds, or a string from older/synced state."""
+    if isinstance(created_at, int | float):
+        from datetime import datetime, timezone
+
+        return datetime.fromtimestamp(created_at, tz=timezone.utc).isoformat(timespec="seconds")
+    return str(created_at)
+
+
+def _print_pod_table(state: dict, pod: dict) -> None:
+    """Print a Rich table for a single pod state and its RunPod record."""
+    from rich.table import Table
+
+    table = Table(title=f"Pod: {state.get('name', '?')}")
     table.add_column("Field", style="bold")
     table.add_column("Value")
 
@@ -300,8 +489,6 @@ def _print_pod_table(runpod_mod, state: dict) -> None:  # noqa: ANN001
         table.add_row("Cost", f"${state['cost_per_hr']:.2f}/hr")
     if state.get("network_volume_id"):
         table.add_row("Volume", state["network_volume_id"])
-    table.add_row("Created", state.get("created_at", "unknown"))
-
-    console.print(table)
-
+    table.add_row("Created", _format_created(state.get("created_at", "unknown")))
 
+    _console().print(table)
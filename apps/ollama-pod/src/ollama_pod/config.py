@@ -1,4 +1,5 @@
 import os
+from functools import cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -16,5 +17,7 @@ def _require(var: str) -> str:
     return value
 
 
+@cache
 def runpod_api_key() -> str:
     return _require("RUNPOD_API_KEY")
+
@@ -1,8 +1,6 @@
 from typing import Literal
 
-import runpod
-
-from ollama_pod.config import runpod_api_key
+from ollama_pod import runpod_api
 
 CloudType = Literal["any", "community", "secure"]
 
@@ -52,9 +50,7 @@ def find_cheapest_gpu(
 
     Returns (gpu_type_id, cost_per_hr, cloud_type_used).
     """
-    runpod.api_key = runpod_api_key()
-
-    gpus = runpod.get_gpus()
+    gpus = runpod_api.get_gpus()
     candidates = [g for g in gpus if g["memoryInGb"] >= min_vram_gb]
 
     if not candidates:
@@ -65,9 +61,9 @@ def find_cheapest_gpu(
 
     best: tuple[str, float, str] | None = None
 
+    # get_gpus() prices every GPU type, so no per-GPU lookups are needed
     for gpu in candidates:
-        detail = runpod.get_gpu(gpu["id"])
-        result = _get_price_and_cloud(detail, cloud_type)
+        result = _get_price_and_cloud(gpu, cloud_type)
         if result is None:
             continue
         price, resolved = result
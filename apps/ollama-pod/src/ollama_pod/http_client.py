@@ -0,0 +1,45 @@
+import atexit
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_TIMEOUT_S = 30
+CONNECT_TIMEOUT_S = 10
+MAX_KEEPALIVE_CONNECTIONS = 8
+
+
+@cache
+def get_client() -> "httpx.Client":
+    """Return the process-wide HTTP client, creating it on first use.
+
+    Sharing one client keeps connections (and TLS sessions) alive across
+    requests to the same host instead of handshaking on every call.
+    """
+    import httpx
+
+    client = httpx.Client(**_client_options())
+    atexit.register(client.close)
+    return client
+
+
+def new_async_client() -> "httpx.AsyncClient":
+    """Return a new AsyncClient configured like get_client().
+
+    Async clients are tied to the event loop that uses them, so this isn't
+    shared; callers own it (`async with new_async_client() as client: ...`).
+    """
+    import httpx
+
+    return httpx.AsyncClient(**_client_options())
+
+
+def _client_options() -> dict:
+    import httpx
+
+    return {
+        "http2": True,
+        "timeout": httpx.Timeout(DEFAULT_TIMEOUT_S, connect=CONNECT_TIMEOUT_S),
+        "limits": httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+    }
@@ -1,9 +1,16 @@
-import httpx
+import json
+import time
+from pathlib import Path
+
+from ollama_pod.http_client import get_client
 
 REGISTRY_BASE = "https://registry.ollama.ai/v2/library"
 MODEL_MEDIA_TYPE = "application/vnd.ollama.image.model"
 VRAM_OVERHEAD_FACTOR = 1.2
 
+MANIFEST_CACHE_DIR = Path.home() / ".ollama-pod" / "manifest-cache"
+MANIFEST_CACHE_TTL_S = 24 * 60 * 60
+
 
 def parse_model(model: str) -> tuple[str, str]:
     """Split 'name:tag' into (name, tag). Defaults to 'latest'."""
@@ -14,12 +21,24 @@ def parse_model(model: str) -> tuple[str, str]:
     return name, tag
 
 
-def get_model_size_gb(model: str) -> float:
-    """Query the Ollama OCI registry for model weight size in GB."""
-    name, tag = parse_model(model)
+def _cache_file(name: str, tag: str) -> Path:
+    return MANIFEST_CACHE_DIR / f"{name.replace('/', '_')}_{tag}.json"
+
+
+def _read_cached_size(path: Path, max_age_s: float | None) -> float | None:
+    """Return the cached size from `path`, or None if missing, unreadable, or too old."""
+    try:
+        if max_age_s is not None and time.time() - path.stat().st_mtime >= max_age_s:
+            return None
+        return json.loads(path.read_bytes())["size_gb"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _fetch_model_size_gb(model: str, name: str, tag: str) -> float:
     url = f"{REGISTRY_BASE}/{name}/manifests/{tag}"
 
-    resp = httpx.get(url, timeout=30)
+    resp = get_client().get(url)
     if resp.status_code == 404:
         raise SystemExit(f"Model not found: {model!r} (registry returned 404)")
     resp.raise_for_status()
@@ -36,6 +55,34 @@ def get_model_size_gb(model: str) -> float:
     return total_bytes / (1024**3)
 
 
+def get_model_size_gb(model: str) -> float:
+    """Query the Ollama OCI registry for model weight size in GB.
+
+    Sizes are cached under MANIFEST_CACHE_DIR for MANIFEST_CACHE_TTL_S. If the
+    registry can't be reached, a stale cached size is used when available.
+    """
+    import httpx
+
+    name, tag = parse_model(model)
+    cache_file = _cache_file(name, tag)
+
+    cached = _read_cached_size(cache_file, MANIFEST_CACHE_TTL_S)
+    if cached is not None:
+        return cached
+
+    try:
+        size_gb = _fetch_model_size_gb(model, name, tag)
+    except httpx.HTTPError:
+        stale = _read_cached_size(cache_file, None)
+        if stale is None:
+            raise
+        return stale
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"size_gb": size_gb}))
+    return size_gb
+
+
 def estimate_vram_gb(model: str) -> float:
     """Estimate VRAM needed: model size * overhead factor."""
     return get_model_size_gb(model) * VRAM_OVERHEAD_FACTOR
@@ -1,31 +1,111 @@
+import itertools
+import json
+import random
+import re
+import socket
 import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Literal, cast
 
-import httpx
-import runpod
-from runpod.error import QueryError
+from ollama_pod import runpod_api
+from ollama_pod.http_client import CONNECT_TIMEOUT_S, get_client, new_async_client
+from ollama_pod.runpod_api import AuthError, QueryError
 
-from ollama_pod.config import runpod_api_key
+if TYPE_CHECKING:
+    import httpx
 
 OLLAMA_IMAGE = "surajarogyalabs/kenai-ollama:latest"
 OLLAMA_PORT = 11434
-POLL_INTERVAL_S = 5
+# Matches OLLAMA_PORT as an entry of a pod's `ports` string, e.g. "22/tcp,11434/tcp"
+_OLLAMA_PORT_RE = re.compile(rf"(?:^|,)\s*{OLLAMA_PORT}(?:/\w+)?\s*(?=,|$)")
+# wait_for_ready polls with exponential backoff: 0.5s, 0.75s, ... capped at 10s
+POLL_INITIAL_S = 0.5
+POLL_MAX_S = 10.0
+POLL_BACKOFF = 1.5
+# Once the runtime is up, readiness is a TCP connect to the Ollama port mapping.
+# Probes are cheap, so they retry on a short fixed interval instead of the backoff.
+PROBE_TIMEOUT_S = 2.0
+PROBE_INTERVAL_S = 0.5
+
+# create_ollama_pod retries deployments RunPod rejects for lack of capacity,
+# sleeping with decorrelated jitter between CREATE_RETRY_BASE_S and _CAP_S
+CREATE_ATTEMPTS = 3
+CREATE_RETRY_BASE_S = 5.0
+CREATE_RETRY_CAP_S = 45.0
+_RETRYABLE_CREATE_ERROR = re.compile(
+    r"no resources|not available|no longer any instances|no offer", re.IGNORECASE
+)
+
+# find_ollama_pods caches the filtered pod list briefly so back-to-back
+# invocations (e.g. from a shell prompt) share one API call
+POD_CACHE_FILE = Path.home() / ".ollama-pod" / "pods-cache.json"
+POD_CACHE_TTL_S = 10
+
+# Ollama server settings applied to new pods. Ollama serializes requests by
+# default; a few parallel slots let concurrent clients share the loaded model.
+DEFAULT_NUM_PARALLEL = 4
+DEFAULT_MAX_LOADED_MODELS = 1
+DEFAULT_KEEP_ALIVE = "24h"
+
+# create_pod arguments shared by every Ollama pod
+_BASE_POD_KWARGS = MappingProxyType({
+    "ports": f"{OLLAMA_PORT}/tcp",
+    "container_disk_in_gb": 20,
+})
+
+# Upper bound on concurrent terminate requests in terminate_pods
+MAX_TERMINATE_CONCURRENCY = 8
+
+RunPodCloudType = Literal["ALL", "COMMUNITY", "SECURE"]
 
 # Map CLI cloud_type values to RunPod mutation cloudType values
-CLOUD_TYPE_MAP = {
+CLOUD_TYPE_MAP: MappingProxyType[str, RunPodCloudType] = MappingProxyType({
     "any": "ALL",
     "community": "COMMUNITY",
     "secure": "SECURE",
-}
+})
+_RUNPOD_CLOUD_TYPES = frozenset(CLOUD_TYPE_MAP.values())
+
+
+def normalize_cloud_type(cloud_type: str) -> RunPodCloudType:
+    """Return the RunPod cloudType for a CLI value ("any", ...) or RunPod value ("ALL", ...).
+
+    Raises ValueError for anything else.
+    """
+    value = CLOUD_TYPE_MAP.get(cloud_type.lower(), cloud_type.upper())
+    if value not in _RUNPOD_CLOUD_TYPES:
+        raise ValueError(f"Unknown cloud type: {cloud_type!r}")
+    return cast(RunPodCloudType, value)
+
+
+class PodError(RuntimeError):
+    """A pod operation failed (rejected deployment, pull error, ...)."""
+
+
+class PodTimeoutError(PodError):
+    """A pod did not become ready in time."""
+
+
+def _index_volumes(user_info: dict) -> dict[str, str | None]:
+    return {vol["id"]: vol.get("dataCenterId") for vol in user_info.get("networkVolumes") or []}
 
 
 def resolve_volume_datacenter(network_volume_id: str) -> str | None:
-    """Look up the datacenter ID for a network volume. Returns None if not found."""
-    runpod.api_key = runpod_api_key()
-    user_info = runpod.get_user()
-    for vol in user_info.get("networkVolumes", []):
-        if vol["id"] == network_volume_id:
-            return vol.get("dataCenterId")
-    return None
+    """Look up the datacenter ID for a network volume. Returns None if not found.
+
+    Reads the account record cached by runpod_api.get_user; call
+    `runpod_api.get_user.cache_clear()` to pick up a new volume immediately.
+    """
+    return _index_volumes(runpod_api.get_user()).get(network_volume_id)
+
+
+async def async_resolve_volume_datacenter(
+    network_volume_id: str, *, client: "httpx.AsyncClient | None" = None
+) -> str | None:
+    """Async resolve_volume_datacenter."""
+    return _index_volumes(await runpod_api.async_get_user(client=client)).get(network_volume_id)
 
 
 def create_ollama_pod(
@@ -33,64 +113,202 @@ def create_ollama_pod(
     *,
     name: str = "default",
     network_volume_id: str | None = None,
-    cloud_type: str = "ALL",
+    cloud_type: RunPodCloudType = "ALL",
     image: str | None = None,
+    data_center_id: str | None = None,
+    env: dict[str, str] | None = None,
+    num_parallel: int = DEFAULT_NUM_PARALLEL,
+    max_loaded_models: int = DEFAULT_MAX_LOADED_MODELS,
+    on_retry: Callable[[int, float], None] | None = None,
 ) -> str:
     """Create a RunPod pod running Ollama. Returns the pod ID.
 
     cloud_type: "ALL", "COMMUNITY", or "SECURE" (RunPod mutation values).
     image: Docker image to use. Defaults to OLLAMA_IMAGE.
+    data_center_id: Datacenter to deploy in. Defaults to the network volume's
+        datacenter, so RunPod doesn't have to resolve it from the volume.
+    env: Extra container environment variables; these override the
+        OLLAMA_NUM_PARALLEL / OLLAMA_MAX_LOADED_MODELS / OLLAMA_KEEP_ALIVE
+        values derived from `num_parallel`, `max_loaded_models` and
+        DEFAULT_KEEP_ALIVE.
 
-    Raises SystemExit with actionable message if RunPod rejects the
-    GPU + cloud_type + datacenter combination.
+    Capacity errors ("no resources available", ...) are retried up to
+    CREATE_ATTEMPTS times; before each retry `on_retry` is called with the
+    upcoming attempt number and the delay in seconds. Raises PodError with an actionable message if
+    RunPod still rejects the GPU + cloud_type + datacenter combination.
     """
-    runpod.api_key = runpod_api_key()
-
     kwargs: dict = {
+        **_BASE_POD_KWARGS,
         "name": f"ollama-{name}",
         "image_name": image or OLLAMA_IMAGE,
         "gpu_type_id": gpu_type_id,
         "cloud_type": cloud_type,
-        "ports": f"{OLLAMA_PORT}/tcp",
-        "container_disk_in_gb": 20,
     }
 
     if network_volume_id:
+        if data_center_id is None:
+            data_center_id = resolve_volume_datacenter(network_volume_id)
         kwargs["network_volume_id"] = network_volume_id
         kwargs["volume_mount_path"] = "/runpod-volume"
     else:
         kwargs["volume_in_gb"] = 50
+    if data_center_id:
+        kwargs["data_center_id"] = data_center_id
+
+    kwargs["env"] = {
+        "OLLAMA_NUM_PARALLEL": str(num_parallel),
+        "OLLAMA_MAX_LOADED_MODELS": str(max_loaded_models),
+        "OLLAMA_KEEP_ALIVE": DEFAULT_KEEP_ALIVE,
+        **(env or {}),
+    }
 
     try:
-        pod = runpod.create_pod(**kwargs)
+        pod = _create_pod_with_retry(kwargs, on_retry)
+    except AuthError:
+        raise
     except QueryError as exc:
         msg = str(exc)
         # Provide actionable context when RunPod rejects the combination
         if network_volume_id and cloud_type != "ALL":
-            raise SystemExit(
+            raise PodError(
                 f"RunPod rejected deployment: {msg}\n"
                 f"  GPU {gpu_type_id} may not be available as "
                 f"{cloud_type.lower()} cloud in the datacenter "
                 f"pinned by volume {network_volume_id}.\n"
                 f"  Try --cloud-type any, or pick a different --gpu-type."
             ) from exc
-        raise SystemExit(f"RunPod rejected deployment: {msg}") from exc
+        raise PodError(f"RunPod rejected deployment: {msg}") from exc
 
+    invalidate_pod_cache()
     return pod["id"]
 
 
-def wait_for_ready(pod_id: str, timeout: int = 300) -> dict:
-    """Poll until the pod's runtime is populated. Returns pod info."""
-    runpod.api_key = runpod_api_key()
+def _create_pod_with_retry(
+    kwargs: dict, on_retry: Callable[[int, float], None] | None = None
+) -> dict:
+    """Call runpod_api.create_pod, retrying transient capacity errors.
+
+    Other errors, and the error from the last attempt, propagate.
+    """
+    delay = CREATE_RETRY_BASE_S
+    for attempt in range(2, CREATE_ATTEMPTS + 1):
+        try:
+            return runpod_api.create_pod(**kwargs)
+        except QueryError as exc:
+            if not _RETRYABLE_CREATE_ERROR.search(str(exc)):
+                raise
+        delay = random.uniform(CREATE_RETRY_BASE_S, min(CREATE_RETRY_CAP_S, delay * 3))
+        if on_retry is not None:
+            on_retry(attempt, delay)
+        time.sleep(delay)
+    return runpod_api.create_pod(**kwargs)
+
+
+def wait_for_ready(
+    pod_id: str, timeout: int = 300, *, poll_interval: float | None = None
+) -> dict:
+    """Wait until the pod's runtime is populated and Ollama accepts connections.
 
+    Returns the pod's `id` and `runtime` (what get_endpoint needs).
+
+    Polls RunPod until the runtime appears, then probes the pod's direct
+    ip:port mapping with a TCP connect instead of further API calls (pods
+    only reachable through the HTTP proxy are returned without probing).
+    API polls retry immediately, then with exponential backoff unless
+    `poll_interval` pins a fixed delay; probes retry every PROBE_INTERVAL_S.
+    The last sleep is cut short at the deadline.
+    Raises PodTimeoutError if the pod isn't ready within `timeout` seconds.
+    """
+    delays = _poll_delays(poll_interval)
     deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        pod = runpod.get_pod(pod_id)
-        if pod.get("runtime"):
+    pod = None
+    while True:
+        if not (pod and pod.get("runtime")):
+            pod = runpod_api.get_pod_runtime(pod_id)
+            if pod and pod.get("runtime"):
+                delays = itertools.repeat(PROBE_INTERVAL_S)
+        if pod and pod.get("runtime") and _accepts_connections(pod, deadline):
             return pod
-        time.sleep(POLL_INTERVAL_S)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # Never sleep past the deadline, so `timeout` is honoured even at the cap
+        time.sleep(min(next(delays), remaining))
+
+    raise PodTimeoutError(f"Pod {pod_id} did not become ready within {timeout}s")
+
+
+async def async_wait_for_ready(
+    pod_id: str,
+    timeout: int = 300,
+    *,
+    poll_interval: float | None = None,
+    client: "httpx.AsyncClient | None" = None,
+) -> dict:
+    """Async wait_for_ready; polls on the event loop instead of blocking a thread."""
+    import asyncio
+
+    delays = _poll_delays(poll_interval)
+    deadline = time.monotonic() + timeout
+    pod = None
+    while True:
+        if not (pod and pod.get("runtime")):
+            pod = await runpod_api.async_get_pod_runtime(pod_id, client=client)
+            if pod and pod.get("runtime"):
+                delays = itertools.repeat(PROBE_INTERVAL_S)
+        if pod and pod.get("runtime") and await _async_accepts_connections(pod, deadline):
+            return pod
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(next(delays), remaining))
+
+    raise PodTimeoutError(f"Pod {pod_id} did not become ready within {timeout}s")
+
+
+def _probe_timeout(deadline: float) -> float:
+    """PROBE_TIMEOUT_S, cut short so a probe never runs past `deadline`."""
+    return min(PROBE_TIMEOUT_S, max(deadline - time.monotonic(), 0.0))
+
+
+def _accepts_connections(pod: dict, deadline: float) -> bool:
+    """TCP-probe the pod's direct Ollama mapping. True if there is none to probe."""
+    port_info = _direct_port(pod)
+    if port_info is None:
+        return True
+    address = (port_info["ip"], port_info["publicPort"])
+    try:
+        with socket.create_connection(address, timeout=_probe_timeout(deadline)):
+            return True
+    except OSError:
+        return False
 
-    raise SystemExit(f"Pod {pod_id} did not become ready within {timeout}s")
+
+async def _async_accepts_connections(pod: dict, deadline: float) -> bool:
+    """Async _accepts_connections."""
+    import asyncio
+
+    port_info = _direct_port(pod)
+    if port_info is None:
+        return True
+    connect = asyncio.open_connection(port_info["ip"], port_info["publicPort"])
+    try:
+        _, writer = await asyncio.wait_for(connect, _probe_timeout(deadline))
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+def _poll_delays(poll_interval: float | None) -> Iterator[float]:
+    """Yield wait_for_ready's delays: `poll_interval` forever, or the backoff schedule."""
+    if poll_interval is not None:
+        yield from itertools.repeat(poll_interval)
+    interval = POLL_INITIAL_S
+    while True:
+        yield interval
+        interval = min(interval * POLL_BACKOFF, POLL_MAX_S)
 
 
 def get_endpoint(pod: dict) -> str:
@@ -99,34 +317,154 @@ def get_endpoint(pod: dict) -> str:
     Prefers the TCP port mapping (ip:port) when available, falls back
     to the RunPod HTTP proxy URL.
     """
-    runtime = pod.get("runtime") or {}
-    for port_info in runtime.get("ports") or []:
-        if port_info.get("privatePort") == OLLAMA_PORT and port_info.get("ip"):
-            ip = port_info["ip"]
-            public_port = port_info["publicPort"]
-            protocol = "https" if port_info.get("type") == "http" else "http"
-            return f"{protocol}://{ip}:{public_port}"
+    port_info = _direct_port(pod)
+    if port_info is not None:
+        protocol = "https" if port_info.get("type") == "http" else "http"
+        return f"{protocol}://{port_info['ip']}:{port_info['publicPort']}"
 
     # Fallback: RunPod HTTP proxy
-    pod_id = pod["id"]
-    return f"https://{pod_id}-{OLLAMA_PORT}.proxy.runpod.net"
+    return f"https://{pod['id']}-{OLLAMA_PORT}.proxy.runpod.net"
+
 
+def _direct_port(pod: dict) -> dict | None:
+    """Return the runtime port mapping for the Ollama port, if it has an IP."""
+    ports = (pod.get("runtime") or {}).get("ports") or []
+    return next((p for p in ports if p.get("privatePort") == OLLAMA_PORT and p.get("ip")), None)
+
+
+def pull_model(
+    endpoint: "httpx.URL | str",
+    model: str,
+    timeout: int = 600,
+    *,
+    on_progress: Callable[[dict], None] | None = None,
+) -> None:
+    """Pull a model on the remote Ollama instance.
+
+    Consumes Ollama's NDJSON progress stream; each event (with `status` and,
+    while downloading, `completed`/`total` bytes) is passed to `on_progress`.
+    Raises PodError as soon as the server reports an error.
+    """
+    import httpx
 
-def pull_model(endpoint: str, model: str, timeout: int = 600) -> None:
-    """Pull a model on the remote Ollama instance."""
-    url = f"{endpoint}/api/pull"
-    resp = httpx.post(url, json={"name": model, "stream": False}, timeout=timeout)
-    resp.raise_for_status()
+    url = _api_url(endpoint, "pull")
+    payload = {"name": model, "stream": True}
+    # `timeout` bounds each read, not the whole pull; connecting fails fast
+    request_timeout = httpx.Timeout(timeout, connect=CONNECT_TIMEOUT_S)
+    with get_client().stream("POST", url, json=payload, timeout=request_timeout) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            _handle_pull_event(line, on_progress)
+
+
+async def async_pull_model(
+    endpoint: "httpx.URL | str",
+    model: str,
+    timeout: int = 600,
+    *,
+    on_progress: Callable[[dict], None] | None = None,
+    client: "httpx.AsyncClient | None" = None,
+) -> None:
+    """Async pull_model, for pulling onto several pods concurrently."""
+    import httpx
+
+    if client is None:
+        async with new_async_client() as client:
+            return await async_pull_model(
+                endpoint, model, timeout, on_progress=on_progress, client=client
+            )
+
+    url = _api_url(endpoint, "pull")
+    payload = {"name": model, "stream": True}
+    request_timeout = httpx.Timeout(timeout, connect=CONNECT_TIMEOUT_S)
+    async with client.stream("POST", url, json=payload, timeout=request_timeout) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            _handle_pull_event(line, on_progress)
+
+
+def _api_url(endpoint: "httpx.URL | str", name: str) -> str:
+    """Join an Ollama endpoint (with or without a trailing slash) and an API route."""
+    return f"{str(endpoint).rstrip('/')}/api/{name}"
+
+
+def _handle_pull_event(line: str, on_progress: Callable[[dict], None] | None) -> None:
+    """Parse one NDJSON line from /api/pull, raising on server-reported errors."""
+    if not line:
+        return
+    event = json.loads(line)
+    if event.get("error"):
+        raise PodError(event["error"])
+    if on_progress is not None:
+        on_progress(event)
 
 
 def find_ollama_pods() -> list[dict]:
-    """Return all RunPod pods that expose the Ollama port (11434)."""
-    runpod.api_key = runpod_api_key()
-    pods = runpod.get_pods()
-    return [p for p in pods if str(OLLAMA_PORT) in (p.get("ports") or "")]
+    """Return all RunPod pods that expose the Ollama port (11434).
+
+    Results are cached in POD_CACHE_FILE for POD_CACHE_TTL_S seconds.
+    """
+    try:
+        if time.time() - POD_CACHE_FILE.stat().st_mtime < POD_CACHE_TTL_S:
+            return json.loads(POD_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        pass
+
+    pods = runpod_api.get_pods()
+    ollama_pods = [p for p in pods if _OLLAMA_PORT_RE.search(p.get("ports") or "")]
+
+    POD_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = POD_CACHE_FILE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(ollama_pods))
+    tmp.replace(POD_CACHE_FILE)
+    return ollama_pods
+
+
+def invalidate_pod_cache() -> None:
+    """Drop the cached pod list; called whenever pods are created or terminated."""
+    POD_CACHE_FILE.unlink(missing_ok=True)
 
 
 def terminate_pod(pod_id: str) -> None:
     """Terminate a RunPod pod."""
-    runpod.api_key = runpod_api_key()
-    runpod.terminate_pod(pod_id)
+    runpod_api.terminate_pod(pod_id)
+    invalidate_pod_cache()
+
+
+async def async_terminate_pod(pod_id: str, *, client: "httpx.AsyncClient | None" = None) -> None:
+    """Async terminate_pod."""
+    await runpod_api.async_terminate_pod(pod_id, client=client)
+    invalidate_pod_cache()
+
+
+async def terminate_pods(
+    pod_ids: list[str], max_concurrency: int = MAX_TERMINATE_CONCURRENCY
+) -> dict[str, Exception]:
+    """Terminate several pods concurrently over one connection pool.
+
+    At most `max_concurrency` requests are in flight. Every pod is attempted;
+    returns the errors for pods that couldn't be terminated, keyed by pod ID.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with new_async_client() as client:
+
+        async def terminate(pod_id: str) -> None:
+            async with semaphore:
+                await runpod_api.async_terminate_pod(pod_id, client=client)
+
+        results = await asyncio.gather(*map(terminate, pod_ids), return_exceptions=True)
+
+    invalidate_pod_cache()
+    return {pod_id: r for pod_id, r in zip(pod_ids, results) if isinstance(r, Exception)}
+
+
+def terminate_pods_sync(
+    pod_ids: list[str], max_concurrency: int = MAX_TERMINATE_CONCURRENCY
+) -> dict[str, Exception]:
+    """Blocking terminate_pods, for callers without an event loop."""
+    import asyncio
+
+    return asyncio.run(terminate_pods(pod_ids, max_concurrency))
@@ -0,0 +1,310 @@
+import time
+from collections.abc import Callable
+from functools import cache, wraps
+from typing import TYPE_CHECKING
+
+from ollama_pod.http_client import get_client, new_async_client
+
+if TYPE_CHECKING:
+    import httpx
+
+# Thin replacement for the runpod SDK: only the queries and mutations
+# ollama-pod uses, sent through the shared httpx client.
+GRAPHQL_URL = "https://api.runpod.io/graphql"
+# The account record and GPU catalog change rarely; reuse them for this long
+CATALOG_CACHE_TTL_S = 60
+
+_POD_FIELDS = """
+    id
+    name
+    costPerHr
+    desiredStatus
+    imageName
+    lastStatusChange
+    ports
+    runtime {
+        ports {
+            ip
+            isIpPublic
+            privatePort
+            publicPort
+            type
+        }
+    }
+    machine {
+        gpuDisplayName
+    }
+"""
+
+# get_pods returns every pod on the account, so it only selects what
+# find_ollama_pods and the CLI's status sync read.
+_POD_LIST_FIELDS = """
+    id
+    name
+    costPerHr
+    desiredStatus
+    lastStatusChange
+    ports
+    runtime {
+        ports {
+            ip
+            privatePort
+            publicPort
+            type
+        }
+    }
+    machine {
+        gpuDisplayName
+    }
+"""
+
+_QUERY_USER = """
+query myself {
+    myself {
+        id
+        networkVolumes {
+            id
+            name
+            size
+            dataCenterId
+        }
+    }
+}
+"""
+
+# Pricing is requested for every GPU type in the same query, so ranking GPUs
+# needs a single round-trip.
+_QUERY_GPU_TYPES = """
+query GpuTypes {
+    gpuTypes {
+        id
+        displayName
+        memoryInGb
+        secureCloud
+        communityCloud
+        securePrice
+        communityPrice
+        lowestPrice(input: {gpuCount: 1}) {
+            minimumBidPrice
+            uninterruptablePrice
+        }
+    }
+}
+"""
+
+_QUERY_PODS = f"query myPods {{ myself {{ pods {{ {_POD_LIST_FIELDS} }} }} }}"
+
+_QUERY_POD = f"query pod($podId: String!) {{ pod(input: {{podId: $podId}}) {{ {_POD_FIELDS} }} }}"
+
+# wait_for_ready polls this until the runtime appears; it needs only enough
+# to build the endpoint, so the poll doesn't fetch the whole pod each time.
+_QUERY_POD_RUNTIME = """
+query podRuntime($podId: String!) {
+    pod(input: {podId: $podId}) {
+        id
+        runtime {
+            ports {
+                ip
+                privatePort
+                publicPort
+                type
+            }
+        }
+    }
+}
+"""
+
+_MUTATION_DEPLOY = """
+mutation deploy($input: PodFindAndDeployOnDemandInput) {
+    podFindAndDeployOnDemand(input: $input) {
+        id
+        imageName
+        machineId
+    }
+}
+"""
+
+_MUTATION_TERMINATE = """
+mutation terminate($podId: String!) {
+    podTerminate(input: {podId: $podId})
+}
+"""
+
+
+class QueryError(RuntimeError):
+    """RunPod answered a GraphQL request with an error."""
+
+
+class AuthError(QueryError):
+    """RunPod rejected the API key."""
+
+
+def ttl_cache(ttl_s: float) -> Callable[[Callable], Callable]:
+    """Memoize a function's results for `ttl_s` seconds, keyed by positional args.
+
+    Like functools.cache, the wrapper gets a `cache_clear()` method.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        entries: dict[tuple, tuple[float, object]] = {}
+
+        @wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = entries.get(args)
+            if hit is not None and now - hit[0] < ttl_s:
+                return hit[1]
+            value = fn(*args)
+            entries[args] = (now, value)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
+
+
+@cache
+def _auth_headers() -> dict[str, str]:
+    """Build the RunPod auth header once per process.
+
+    It's passed per request rather than set on the shared client, which also
+    talks to the Ollama registry and to pods and must not leak the key.
+    """
+    from ollama_pod.config import runpod_api_key
+
+    return {"Authorization": f"Bearer {runpod_api_key()}"}
+
+
+def _gql(query: str, variables: dict | None = None) -> dict:
+    """POST a GraphQL request to RunPod and return its `data` payload."""
+    resp = get_client().post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": variables or {}},
+        headers=_auth_headers(),
+    )
+    return _data(resp)
+
+
+async def _agql(
+    query: str, variables: dict | None = None, *, client: "httpx.AsyncClient | None" = None
+) -> dict:
+    """Async _gql. Uses `client` if given, otherwise a short-lived one."""
+    if client is None:
+        async with new_async_client() as client:
+            return await _agql(query, variables, client=client)
+    resp = await client.post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": variables or {}},
+        headers=_auth_headers(),
+    )
+    return _data(resp)
+
+
+def _data(resp: "httpx.Response") -> dict:
+    """Return the `data` payload of a GraphQL response, raising on errors."""
+    if resp.status_code == 401:
+        raise AuthError("RunPod rejected the API key (401). Check RUNPOD_API_KEY.")
+
+    try:
+        body = resp.json()
+    except ValueError:
+        resp.raise_for_status()
+        raise
+    if body.get("errors"):
+        raise QueryError(body["errors"][0]["message"])
+    resp.raise_for_status()
+    return body["data"]
+
+
+@ttl_cache(CATALOG_CACHE_TTL_S)
+def get_user() -> dict:
+    """Return the account record, including its network volumes."""
+    return _gql(_QUERY_USER)["myself"]
+
+
+@ttl_cache(CATALOG_CACHE_TTL_S)
+def get_gpus() -> list[dict]:
+    """Return all GPU types with memory, availability and pricing."""
+    return _gql(_QUERY_GPU_TYPES)["gpuTypes"]
+
+
+def get_pods() -> list[dict]:
+    """Return all pods on the account."""
+    return _gql(_QUERY_PODS)["myself"]["pods"]
+
+
+def get_pod(pod_id: str) -> dict | None:
+    """Return a single pod, or None if it doesn't exist."""
+    return _gql(_QUERY_POD, {"podId": pod_id})["pod"]
+
+
+def get_pod_runtime(pod_id: str) -> dict | None:
+    """Return just a pod's `id` and `runtime` port mappings, or None if it doesn't exist."""
+    return _gql(_QUERY_POD_RUNTIME, {"podId": pod_id})["pod"]
+
+
+def create_pod(
+    *,
+    name: str,
+    image_name: str,
+    gpu_type_id: str,
+    cloud_type: str = "ALL",
+    ports: str | None = None,
+    container_disk_in_gb: int = 10,
+    volume_in_gb: int = 0,
+    volume_mount_path: str = "/runpod-volume",
+    network_volume_id: str | None = None,
+    data_center_id: str | None = None,
+    env: dict[str, str] | None = None,
+) -> dict:
+    """Deploy an on-demand GPU pod. Returns the created pod (with its `id`).
+
+    With a network volume, pass the volume's datacenter as `data_center_id`
+    (pod.create_ollama_pod resolves it); it isn't looked up here.
+    """
+    pod_input: dict = {
+        "name": name,
+        "imageName": image_name,
+        "gpuTypeId": gpu_type_id,
+        "cloudType": cloud_type,
+        "gpuCount": 1,
+        "supportPublicIp": True,
+        "startSsh": True,
+        "containerDiskInGb": container_disk_in_gb,
+        "volumeInGb": volume_in_gb,
+        "volumeMountPath": volume_mount_path,
+        "minVcpuCount": 1,
+        "minMemoryInGb": 1,
+        "dataCenterId": data_center_id,
+    }
+    if ports is not None:
+        pod_input["ports"] = ports.replace(" ", "")
+    if network_volume_id is not None:
+        pod_input["networkVolumeId"] = network_volume_id
+    if env:
+        pod_input["env"] = [{"key": k, "value": v} for k, v in env.items()]
+
+    return _gql(_MUTATION_DEPLOY, {"input": pod_input})["podFindAndDeployOnDemand"]
+
+
+def terminate_pod(pod_id: str) -> None:
+    """Terminate a pod."""
+    _gql(_MUTATION_TERMINATE, {"podId": pod_id})
+
+
+async def async_get_user(*, client: "httpx.AsyncClient | None" = None) -> dict:
+    """Async get_user."""
+    return (await _agql(_QUERY_USER, client=client))["myself"]
+
+
+async def async_get_pod_runtime(
+    pod_id: str, *, client: "httpx.AsyncClient | None" = None
+) -> dict | None:
+    """Async get_pod_runtime."""
+    return (await _agql(_QUERY_POD_RUNTIME, {"podId": pod_id}, client=client))["pod"]
+
+
+async def async_terminate_pod(pod_id: str, *, client: "httpx.AsyncClient | None" = None) -> None:
+    """Async terminate_pod."""
+    await _agql(_MUTATION_TERMINATE, {"podId": pod_id}, client=client)
@@ -0,0 +1,31 @@
+import json
+from collections.abc import Callable
+from types import ModuleType
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def mock_client(monkeypatch: pytest.MonkeyPatch) -> Callable:
+    """Patch `module.get_client` to route requests to a handler.
+
+    Returns a function `(module, handler)` that installs the mock and returns
+    the list of JSON request bodies seen (requests without a body are skipped).
+    """
+
+    def install(
+        module: ModuleType, handler: Callable[[httpx.Request], httpx.Response]
+    ) -> list[dict]:
+        bodies: list[dict] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            if request.content:
+                bodies.append(json.loads(request.content))
+            return handler(request)
+
+        client = httpx.Client(transport=httpx.MockTransport(record))
+        monkeypatch.setattr(module, "get_client", lambda: client)
+        return bodies
+
+    return install
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from ollama_pod import cli
+from ollama_pod.pod import PodTimeoutError
+from ollama_pod.runpod_api import AuthError
+
+
+@pytest.fixture(autouse=True)
+def _isolate_state(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(cli, "PODS_DIR", tmp_path / "pods")
+
+
+def test_save_and_load_state_roundtrip() -> None:
+    cli._save_state("gpu1", {"pod_id": "pod-1", "model": "qwen2.5:7b"})
+
+    assert cli._load_state("gpu1") == {"pod_id": "pod-1", "model": "qwen2.5:7b", "name": "gpu1"}
+    assert cli._load_state("missing") is None
+
+
+def test_save_state_leaves_no_temp_file() -> None:
+    cli._save_state("gpu1", {"pod_id": "pod-1"})
+    cli._save_state("gpu1", {"pod_id": "pod-2"})
+
+    assert [p.name for p in cli.PODS_DIR.iterdir()] == ["gpu1.json"]
+    assert cli._load_state("gpu1")["pod_id"] == "pod-2"
+
+
+def test_load_all_states_sorted_and_ignores_other_files() -> None:
+    cli._save_state("b", {"pod_id": "pod-b"})
+    cli._save_state("a", {"pod_id": "pod-a"})
+    (cli.PODS_DIR / "c.json.tmp").write_text("{")
+
+    assert [s["name"] for s in cli._load_all_states()] == ["a", "b"]
+
+
+def test_load_all_states_without_state_dir() -> None:
+    assert cli._load_all_states() == []
+
+
+def test_clear_state() -> None:
+    cli._save_state("gpu1", {"pod_id": "pod-1"})
+    cli._clear_state("gpu1")
+    cli._clear_state("gpu1")  # clearing an already-cleared pod is a no-op
+
+    assert cli._load_state("gpu1") is None
+
+
+def test_status_fetches_all_pods_and_cleans_up_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, pod_id in (("a", "pod-a"), ("b", "pod-gone")):
+        cli._save_state(
+            name,
+            {"pod_id": pod_id, "model": "m", "endpoint": "http://x", "gpu_type": "g", "created_at": "t"},
+        )
+    live = {"pod-a": {"id": "pod-a", "desiredStatus": "RUNNING", "runtime": {}}}
+    monkeypatch.setattr(cli.runpod_api, "get_pod", lambda pod_id: live.get(pod_id))
+
+    result = CliRunner().invoke(cli.app, ["status"])
+
+    assert result.exit_code == 0
+    assert "Pod: a" in result.output
+    assert "'b' (pod-gone) not found on RunPod" in result.output
+    assert cli._load_state("a") is not None
+    assert cli._load_state("b") is None
+
+
+def test_format_created() -> None:
+    assert cli._format_created(0) == "1970-01-01T00:00:00+00:00"
+    assert cli._format_created(1700000000.75) == "2023-11-14T22:13:20+00:00"
+    # Older state files stored ISO strings; synced pods store RunPod's text
+    assert cli._format_created("2024-01-01T00:00:00+00:00") == "2024-01-01T00:00:00+00:00"
+
+
+def test_parse_env() -> None:
+    assert cli._parse_env(["A=1", "B=x=y", "C="]) == {"A": "1", "B": "x=y", "C": ""}
+    with pytest.raises(typer.BadParameter):
+        cli._parse_env(["NOVALUE"])
+
+
+def test_up_terminates_pod_that_never_becomes_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    terminated: list[str] = []
+
+    def wait_for_ready(pod_id: str) -> dict:
+        raise PodTimeoutError(f"Pod {pod_id} did not become ready within 300s")
+
+    monkeypatch.setattr(cli, "create_ollama_pod", lambda *args, **kwargs: "pod-1")
+    monkeypatch.setattr(cli, "wait_for_ready", wait_for_ready)
+    monkeypatch.setattr(cli, "terminate_pod", terminated.append)
+
+    result = CliRunner().invoke(cli.app, ["up", "qwen2.5:7b", "--vram", "8", "--gpu-type", "NVIDIA RTX A5000"])
+
+    assert result.exit_code == 1
+    assert terminated == ["pod-1"]
+    assert cli._load_state("default") is None
+
+
+def test_down_all_clears_only_terminated_pods(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli._save_state("a", {"pod_id": "pod-a"})
+    cli._save_state("b", {"pod_id": "pod-b"})
+    monkeypatch.setattr(cli, "terminate_pods_sync", lambda pod_ids: {"pod-b": RuntimeError("boom")})
+
+    result = CliRunner().invoke(cli.app, ["down", "--all"])
+
+    assert result.exit_code == 1
+    assert "Pod 'a' (pod-a) terminated." in result.output
+    assert "Failed to terminate pod 'b' (pod-b): boom" in result.output
+    assert cli._load_state("a") is None
+    assert cli._load_state("b") is not None
+
+
+def test_status_exits_on_auth_error_without_clearing_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli._save_state("a", {"pod_id": "pod-a"})
+
+    def get_pod(pod_id: str) -> dict:
+        raise AuthError("RunPod rejected the API key (401). Check RUNPOD_API_KEY.")
+
+    monkeypatch.setattr(cli.runpod_api, "get_pod", get_pod)
+
+    result = CliRunner().invoke(cli.app, ["status"])
+
+    assert result.exit_code == 1
+    assert isinstance(result.exception, SystemExit)
+    assert "RUNPOD_API_KEY" in str(result.exception.__cause__)
+    assert cli._load_state("a") is not None
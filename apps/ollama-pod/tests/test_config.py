@@ -2,7 +2,7 @@ import os
 
 import pytest
 
-from ollama_pod.config import _require
+from ollama_pod.config import _require, runpod_api_key
 
 
 def test_require_returns_value(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -20,3 +20,14 @@ def test_require_raises_on_empty(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("EMPTY_VAR", "")
     with pytest.raises(SystemExit, match="EMPTY_VAR"):
         _require("EMPTY_VAR")
+
+
+def test_runpod_api_key_is_read_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    runpod_api_key.cache_clear()
+    monkeypatch.setenv("RUNPOD_API_KEY", "first-key")
+    assert runpod_api_key() == "first-key"
+
+    monkeypatch.setenv("RUNPOD_API_KEY", "second-key")
+    assert runpod_api_key() == "first-key"
+
+    runpod_api_key.cache_clear()
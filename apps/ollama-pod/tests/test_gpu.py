@@ -1,44 +1,44 @@
 import pytest
-import runpod
 
+from ollama_pod import runpod_api
 from ollama_pod.gpu import find_cheapest_gpu
 
+# Shaped like runpod_api.get_gpus() entries, which carry pricing inline
 FAKE_GPUS = [
-    {"id": "NVIDIA RTX A5000", "memoryInGb": 24},
-    {"id": "NVIDIA RTX A6000", "memoryInGb": 48},
-    {"id": "NVIDIA RTX 4090", "memoryInGb": 24},
-]
-
-FAKE_DETAILS = {
-    "NVIDIA RTX A5000": {
+    {
+        "id": "NVIDIA RTX A5000",
+        "memoryInGb": 24,
         "lowestPrice": {"uninterruptablePrice": 0.16},
         "communityPrice": 0.16,
         "securePrice": 0.27,
         "communityCloud": True,
         "secureCloud": True,
     },
-    "NVIDIA RTX A6000": {
+    {
+        "id": "NVIDIA RTX A6000",
+        "memoryInGb": 48,
         "lowestPrice": {"uninterruptablePrice": 0.32},
         "communityPrice": 0.32,
         "securePrice": 0.44,
         "communityCloud": True,
         "secureCloud": True,
     },
-    "NVIDIA RTX 4090": {
+    {
+        "id": "NVIDIA RTX 4090",
+        "memoryInGb": 24,
         "lowestPrice": {"uninterruptablePrice": 0.34},
         "communityPrice": 0.34,
         "securePrice": None,
         "communityCloud": True,
         "secureCloud": False,
     },
-}
+]
 
 
 @pytest.fixture(autouse=True)
 def _mock_runpod(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("RUNPOD_API_KEY", "test-key")
-    monkeypatch.setattr(runpod, "get_gpus", lambda: FAKE_GPUS)
-    monkeypatch.setattr(runpod, "get_gpu", lambda gpu_id: FAKE_DETAILS[gpu_id])
+    monkeypatch.setattr(runpod_api, "get_gpus", lambda: FAKE_GPUS)
 
 
 def test_find_cheapest_gpu_picks_cheapest() -> None:
@@ -56,21 +56,19 @@ def test_find_cheapest_gpu_respects_vram_filter() -> None:
 
 
 def test_find_cheapest_gpu_no_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(runpod, "get_gpus", lambda: FAKE_GPUS)
+    monkeypatch.setattr(runpod_api, "get_gpus", lambda: FAKE_GPUS)
     with pytest.raises(SystemExit, match="No GPUs found"):
         find_cheapest_gpu(min_vram_gb=100.0)
 
 
 def test_find_cheapest_gpu_none_available(monkeypatch: pytest.MonkeyPatch) -> None:
     unavailable = {
-        "NVIDIA RTX A5000": {
-            "lowestPrice": {"uninterruptablePrice": 0.20},
-            "communityCloud": False,
-            "secureCloud": False,
-        },
+        **FAKE_GPUS[0],
+        "lowestPrice": {"uninterruptablePrice": 0.20},
+        "communityCloud": False,
+        "secureCloud": False,
     }
-    monkeypatch.setattr(runpod, "get_gpus", lambda: [FAKE_GPUS[0]])
-    monkeypatch.setattr(runpod, "get_gpu", lambda gpu_id: unavailable[gpu_id])
+    monkeypatch.setattr(runpod_api, "get_gpus", lambda: [unavailable])
 
     with pytest.raises(SystemExit, match="No available GPUs"):
         find_cheapest_gpu(min_vram_gb=10.0)
@@ -101,16 +99,8 @@ def test_cloud_type_secure_skips_unavailable() -> None:
 
 def test_cloud_type_secure_none_available(monkeypatch: pytest.MonkeyPatch) -> None:
     """All GPUs lack secure cloud — should raise."""
-    no_secure = {
-        "NVIDIA RTX A5000": {
-            "communityPrice": 0.16,
-            "securePrice": None,
-            "communityCloud": True,
-            "secureCloud": False,
-        },
-    }
-    monkeypatch.setattr(runpod, "get_gpus", lambda: [FAKE_GPUS[0]])
-    monkeypatch.setattr(runpod, "get_gpu", lambda gpu_id: no_secure[gpu_id])
+    no_secure = {**FAKE_GPUS[0], "securePrice": None, "secureCloud": False}
+    monkeypatch.setattr(runpod_api, "get_gpus", lambda: [no_secure])
 
     with pytest.raises(SystemExit, match="cloud_type='secure'"):
         find_cheapest_gpu(min_vram_gb=10.0, cloud_type="secure")
@@ -121,3 +111,20 @@ def test_cloud_type_any_is_default_behavior() -> None:
     gpu_id, price, cloud = find_cheapest_gpu(min_vram_gb=10.0, cloud_type="any")
     assert gpu_id == "NVIDIA RTX A5000"
     assert price == 0.16
+
+
+def test_find_cheapest_gpu_skips_unpriced_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """GraphQL returns null pricing for GPU types with no offers; they're skipped."""
+    unpriced = {
+        **FAKE_GPUS[0],
+        "lowestPrice": None,
+        "communityPrice": None,
+        "securePrice": None,
+        "communityCloud": False,
+        "secureCloud": False,
+    }
+    monkeypatch.setattr(runpod_api, "get_gpus", lambda: [unpriced, *FAKE_GPUS[1:]])
+
+    gpu_id, price, _ = find_cheapest_gpu(min_vram_gb=10.0)
+    assert gpu_id == "NVIDIA RTX A6000"
+    assert price == 0.32
@@ -0,0 +1,5 @@
+from ollama_pod.http_client import get_client
+
+
+def test_get_client_is_shared() -> None:
+    assert get_client() is get_client()
@@ -1,6 +1,11 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+
 import httpx
 import pytest
 
+from ollama_pod import model_info
 from ollama_pod.model_info import (
     VRAM_OVERHEAD_FACTOR,
     get_model_size_gb,
@@ -16,8 +21,9 @@ def test_parse_model_without_tag() -> None:
     assert parse_model("llama3") == ("llama3", "latest")
 
 
-def _fake_request(url: str = "https://example.com") -> httpx.Request:
-    return httpx.Request("GET", url)
+@pytest.fixture(autouse=True)
+def _isolate_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(model_info, "MANIFEST_CACHE_DIR", tmp_path / "manifest-cache")
 
 
 def _fake_manifest(model_bytes: int) -> dict:
@@ -35,30 +41,74 @@ def _fake_manifest(model_bytes: int) -> dict:
     }
 
 
-def test_get_model_size_gb(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_get_model_size_gb(mock_client: Callable) -> None:
     model_bytes = 4 * (1024**3)  # 4 GB
 
-    def mock_get(url: str, **kwargs) -> httpx.Response:
-        return httpx.Response(200, json=_fake_manifest(model_bytes), request=_fake_request(url))
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v2/library/test/manifests/latest"
+        return httpx.Response(200, json=_fake_manifest(model_bytes))
 
-    monkeypatch.setattr(httpx, "get", mock_get)
+    mock_client(model_info, handler)
     size = get_model_size_gb("test:latest")
     assert abs(size - 4.0) < 0.01
 
 
-def test_get_model_size_gb_404(monkeypatch: pytest.MonkeyPatch) -> None:
-    def mock_get(url: str, **kwargs) -> httpx.Response:
-        return httpx.Response(404, request=_fake_request(url))
-
-    monkeypatch.setattr(httpx, "get", mock_get)
+def test_get_model_size_gb_404(mock_client: Callable) -> None:
+    mock_client(model_info, lambda request: httpx.Response(404))
     with pytest.raises(SystemExit, match="not found"):
         get_model_size_gb("nonexistent:v1")
 
 
-def test_get_model_size_gb_no_model_layers(monkeypatch: pytest.MonkeyPatch) -> None:
-    def mock_get(url: str, **kwargs) -> httpx.Response:
-        return httpx.Response(200, json={"layers": []}, request=_fake_request(url))
-
-    monkeypatch.setattr(httpx, "get", mock_get)
+def test_get_model_size_gb_no_model_layers(mock_client: Callable) -> None:
+    mock_client(model_info, lambda request: httpx.Response(200, json={"layers": []}))
     with pytest.raises(SystemExit, match="No model layers"):
         get_model_size_gb("empty:latest")
+
+
+def test_get_model_size_gb_uses_fresh_cache(mock_client: Callable) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json=_fake_manifest(2 * (1024**3)))
+
+    mock_client(model_info, handler)
+    assert abs(get_model_size_gb("cached:latest") - 2.0) < 0.01
+    assert abs(get_model_size_gb("cached:latest") - 2.0) < 0.01
+    assert calls == 1
+
+
+def test_get_model_size_gb_refreshes_expired_cache(mock_client: Callable) -> None:
+    mock_client(model_info, lambda request: httpx.Response(200, json=_fake_manifest(1024**3)))
+    get_model_size_gb("old:latest")
+
+    cache_file = model_info.MANIFEST_CACHE_DIR / "old_latest.json"
+    expired = cache_file.stat().st_mtime - model_info.MANIFEST_CACHE_TTL_S - 1
+    os.utime(cache_file, (expired, expired))
+
+    mock_client(model_info, lambda request: httpx.Response(200, json=_fake_manifest(3 * (1024**3))))
+    assert abs(get_model_size_gb("old:latest") - 3.0) < 0.01
+
+
+def test_get_model_size_gb_serves_stale_on_network_error(mock_client: Callable) -> None:
+    mock_client(model_info, lambda request: httpx.Response(200, json=_fake_manifest(1024**3)))
+    get_model_size_gb("stale:latest")
+
+    cache_file = model_info.MANIFEST_CACHE_DIR / "stale_latest.json"
+    os.utime(cache_file, (0, 0))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("offline", request=request)
+
+    mock_client(model_info, handler)
+    assert abs(get_model_size_gb("stale:latest") - 1.0) < 0.01
+
+
+def test_get_model_size_gb_network_error_without_cache(mock_client: Callable) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("offline", request=request)
+
+    mock_client(model_info, handler)
+    with pytest.raises(httpx.ConnectError):
+        get_model_size_gb("uncached:latest")
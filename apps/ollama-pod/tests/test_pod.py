@@ -1,23 +1,57 @@
+import asyncio
+import json
+import socket
 import time
+from collections.abc import Callable
+from pathlib import Path
 
 import httpx
 import pytest
-import runpod
-from runpod.error import QueryError
 
+from ollama_pod import pod as pod_module
+from ollama_pod import runpod_api
 from ollama_pod.pod import (
+    PodError,
+    PodTimeoutError,
+    async_pull_model,
+    async_terminate_pod,
+    async_wait_for_ready,
     create_ollama_pod,
+    find_ollama_pods,
     get_endpoint,
+    normalize_cloud_type,
     pull_model,
     resolve_volume_datacenter,
     terminate_pod,
+    terminate_pods,
+    terminate_pods_sync,
     wait_for_ready,
 )
+from ollama_pod.runpod_api import AuthError, QueryError
+
+# The TTL-cached get_user, saved before any test replaces it with a stub
+_cached_get_user = runpod_api.get_user
+
+
+def _ndjson(events: list[dict]) -> str:
+    return "".join(json.dumps(e) + "\n" for e in events)
 
 
 @pytest.fixture(autouse=True)
 def _mock_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("RUNPOD_API_KEY", "test-key")
+    _cached_get_user.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _mock_volumes(monkeypatch: pytest.MonkeyPatch) -> None:
+    volumes = [{"id": "vol-abc", "dataCenterId": "US-TX-3"}, {"id": "vol-xyz", "dataCenterId": "EU-RO-1"}]
+    monkeypatch.setattr(runpod_api, "get_user", lambda: {"networkVolumes": volumes})
+
+
+@pytest.fixture(autouse=True)
+def _isolate_pod_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(pod_module, "POD_CACHE_FILE", tmp_path / "pods-cache.json")
 
 
 def test_create_ollama_pod_without_volume(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -27,12 +61,13 @@ def test_create_ollama_pod_without_volume(monkeypatch: pytest.MonkeyPatch) -> No
         captured.update(kwargs)
         return {"id": "pod-123"}
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
     pod_id = create_ollama_pod("NVIDIA RTX A5000")
 
     assert pod_id == "pod-123"
     assert captured["volume_in_gb"] == 50
     assert "network_volume_id" not in captured
+    assert "data_center_id" not in captured
 
 
 def test_create_ollama_pod_with_volume(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -42,15 +77,64 @@ def test_create_ollama_pod_with_volume(monkeypatch: pytest.MonkeyPatch) -> None:
         captured.update(kwargs)
         return {"id": "pod-456"}
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
     pod_id = create_ollama_pod("NVIDIA RTX A5000", network_volume_id="vol-abc")
 
     assert pod_id == "pod-456"
     assert captured["network_volume_id"] == "vol-abc"
     assert captured["volume_mount_path"] == "/runpod-volume"
+    assert captured["data_center_id"] == "US-TX-3"
     assert "volume_in_gb" not in captured
 
 
+def test_create_ollama_pod_explicit_datacenter_skips_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: dict = {}
+
+    def mock_create(**kwargs) -> dict:
+        captured.update(kwargs)
+        return {"id": "pod-456"}
+
+    def get_user() -> dict:
+        raise AssertionError("datacenter was given; no lookup expected")
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "get_user", get_user)
+    create_ollama_pod("NVIDIA RTX A5000", network_volume_id="vol-abc", data_center_id="US-KS-2")
+
+    assert captured["data_center_id"] == "US-KS-2"
+
+
+def test_create_ollama_pod_passes_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: dict = {}
+
+    def mock_create(**kwargs) -> dict:
+        captured.update(kwargs)
+        return {"id": "pod-789"}
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    create_ollama_pod("NVIDIA RTX A5000", env={"OLLAMA_KEEP_ALIVE": "-1", "FOO": "bar"})
+
+    assert captured["env"] == {
+        "OLLAMA_NUM_PARALLEL": "4",
+        "OLLAMA_MAX_LOADED_MODELS": "1",
+        "OLLAMA_KEEP_ALIVE": "-1",
+        "FOO": "bar",
+    }
+
+
+def test_create_ollama_pod_sets_num_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: dict = {}
+
+    def mock_create(**kwargs) -> dict:
+        captured.update(kwargs)
+        return {"id": "pod-789"}
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    create_ollama_pod("NVIDIA RTX A5000", num_parallel=8)
+
+    assert captured["env"]["OLLAMA_NUM_PARALLEL"] == "8"
+
+
 def test_get_endpoint_tcp() -> None:
     """Prefers TCP port mapping when runtime has ip:port."""
     pod = {
@@ -80,7 +164,7 @@ def test_wait_for_ready_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
             return {"id": pod_id, "runtime": {"ports": []}}
         return {"id": pod_id}
 
-    monkeypatch.setattr(runpod, "get_pod", mock_get_pod)
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", mock_get_pod)
     monkeypatch.setattr(time, "sleep", lambda _: None)
 
     pod = wait_for_ready("pod-123", timeout=30)
@@ -88,7 +172,7 @@ def test_wait_for_ready_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def test_wait_for_ready_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(runpod, "get_pod", lambda pod_id: {"id": pod_id})
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", lambda pod_id: {"id": pod_id})
     monkeypatch.setattr(time, "sleep", lambda _: None)
 
     # Use a very short timeout so monotonic check fails quickly
@@ -97,33 +181,70 @@ def test_wait_for_ready_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
         time, "monotonic", lambda _start=start, _c=iter(range(1000)): _start + next(_c) * 100
     )
 
-    with pytest.raises(SystemExit, match="did not become ready"):
+    with pytest.raises(PodTimeoutError, match="did not become ready"):
         wait_for_ready("pod-123", timeout=1)
 
 
-def test_pull_model(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_pull_model(mock_client: Callable) -> None:
     captured: dict = {}
 
-    def mock_post(url: str, **kwargs) -> httpx.Response:
-        captured["url"] = url
-        captured["json"] = kwargs.get("json")
-        return httpx.Response(200, json={}, request=httpx.Request("POST", url))
+    events = [
+        {"status": "pulling manifest"},
+        {"status": "pulling abc", "digest": "sha256:abc", "total": 100, "completed": 40},
+        {"status": "success"},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured["url"] = str(request.url)
+        captured["json"] = json.loads(request.content)
+        return httpx.Response(200, text=_ndjson(events))
 
-    monkeypatch.setattr(httpx, "post", mock_post)
-    pull_model("https://pod-123-11434.proxy.runpod.net", "qwen2.5:7b")
+    mock_client(pod_module, handler)
+    seen: list[dict] = []
+    pull_model("https://pod-123-11434.proxy.runpod.net", "qwen2.5:7b", on_progress=seen.append)
 
     assert captured["url"] == "https://pod-123-11434.proxy.runpod.net/api/pull"
-    assert captured["json"] == {"name": "qwen2.5:7b", "stream": False}
+    assert captured["json"] == {"name": "qwen2.5:7b", "stream": True}
+    assert seen == events
+
+
+def test_pull_model_accepts_url(mock_client: Callable) -> None:
+    urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        return httpx.Response(200, text=_ndjson([{"status": "success"}]))
+
+    mock_client(pod_module, handler)
+    pull_model(httpx.URL("http://1.2.3.4:30042/"), "qwen2.5:7b")
+
+    assert urls == ["http://1.2.3.4:30042/api/pull"]
+
+
+def test_pull_model_raises_on_stream_error(mock_client: Callable) -> None:
+    events = [{"status": "pulling manifest"}, {"error": "pull model manifest: file does not exist"}]
+    mock_client(pod_module, lambda request: httpx.Response(200, text=_ndjson(events)))
+
+    with pytest.raises(PodError, match="file does not exist"):
+        pull_model("https://pod-123-11434.proxy.runpod.net", "nope:latest")
 
 
 def test_terminate_pod(monkeypatch: pytest.MonkeyPatch) -> None:
     terminated: list[str] = []
-    monkeypatch.setattr(runpod, "terminate_pod", lambda pod_id: terminated.append(pod_id))
+    monkeypatch.setattr(runpod_api, "terminate_pod", lambda pod_id: terminated.append(pod_id))
 
     terminate_pod("pod-789")
     assert terminated == ["pod-789"]
 
 
+def test_normalize_cloud_type() -> None:
+    assert normalize_cloud_type("any") == "ALL"
+    assert normalize_cloud_type("Community") == "COMMUNITY"
+    assert normalize_cloud_type("SECURE") == "SECURE"
+    with pytest.raises(ValueError, match="Unknown cloud type"):
+        normalize_cloud_type("private")
+
+
 @pytest.mark.parametrize(
     ("cloud_type", "expected"),
     [
@@ -141,7 +262,7 @@ def test_create_ollama_pod_passes_cloud_type(
         captured.update(kwargs)
         return {"id": "pod-ct"}
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
     create_ollama_pod("NVIDIA RTX A5000", cloud_type=cloud_type)
 
     assert captured["cloud_type"] == expected
@@ -154,7 +275,7 @@ def test_create_ollama_pod_defaults_to_all(monkeypatch: pytest.MonkeyPatch) -> N
         captured.update(kwargs)
         return {"id": "pod-default"}
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
     create_ollama_pod("NVIDIA RTX A5000")
 
     assert captured["cloud_type"] == "ALL"
@@ -169,9 +290,10 @@ def test_create_ollama_pod_query_error_with_volume_gives_actionable_message(
     def mock_create(**kwargs) -> dict:
         raise QueryError("No resources available")
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
 
-    with pytest.raises(SystemExit, match="may not be available as secure cloud") as exc_info:
+    with pytest.raises(PodError, match="may not be available as secure cloud") as exc_info:
         create_ollama_pod(
             "NVIDIA RTX 2000 Ada",
             network_volume_id="vol-xyz",
@@ -192,9 +314,10 @@ def test_create_ollama_pod_query_error_without_volume(
     def mock_create(**kwargs) -> dict:
         raise QueryError("No resources available")
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
 
-    with pytest.raises(SystemExit, match="RunPod rejected deployment"):
+    with pytest.raises(PodError, match="RunPod rejected deployment"):
         create_ollama_pod("NVIDIA RTX A5000", cloud_type="SECURE")
 
 
@@ -206,9 +329,10 @@ def test_create_ollama_pod_query_error_cloud_type_all_no_datacenter_hint(
     def mock_create(**kwargs) -> dict:
         raise QueryError("No resources available")
 
-    monkeypatch.setattr(runpod, "create_pod", mock_create)
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
 
-    with pytest.raises(SystemExit, match="RunPod rejected deployment") as exc_info:
+    with pytest.raises(PodError, match="RunPod rejected deployment") as exc_info:
         create_ollama_pod(
             "NVIDIA RTX A5000",
             network_volume_id="vol-xyz",
@@ -217,9 +341,66 @@ def test_create_ollama_pod_query_error_cloud_type_all_no_datacenter_hint(
     assert "may not be available" not in str(exc_info.value)
 
 
+def test_create_ollama_pod_retries_capacity_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = 0
+    sleeps: list[float] = []
+
+    def mock_create(**kwargs) -> dict:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise QueryError("There are no longer any instances available with the requested specifications")
+        return {"id": "pod-retry"}
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    retries: list[tuple[int, float]] = []
+    assert create_ollama_pod("NVIDIA RTX A5000", on_retry=lambda n, d: retries.append((n, d))) == "pod-retry"
+    assert attempts == 3
+    assert len(sleeps) == 2
+    assert retries == [(2, sleeps[0]), (3, sleeps[1])]
+    assert all(pod_module.CREATE_RETRY_BASE_S <= s <= pod_module.CREATE_RETRY_CAP_S for s in sleeps)
+
+
+def test_create_ollama_pod_gives_up_after_max_attempts(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = 0
+
+    def mock_create(**kwargs) -> dict:
+        nonlocal attempts
+        attempts += 1
+        raise QueryError("No resources available")
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+
+    with pytest.raises(PodError, match="No resources available"):
+        create_ollama_pod("NVIDIA RTX A5000")
+    assert attempts == pod_module.CREATE_ATTEMPTS
+
+
+def test_create_ollama_pod_does_not_retry_other_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = 0
+
+    def mock_create(**kwargs) -> dict:
+        nonlocal attempts
+        attempts += 1
+        raise QueryError("Invalid image name")
+
+    def no_sleep(_: float) -> None:
+        raise AssertionError("non-capacity errors must not be retried")
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+    monkeypatch.setattr(time, "sleep", no_sleep)
+
+    with pytest.raises(PodError, match="Invalid image name"):
+        create_ollama_pod("NVIDIA RTX A5000")
+    assert attempts == 1
+
+
 def test_resolve_volume_datacenter_found(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
-        runpod,
+        runpod_api,
         "get_user",
         lambda: {
             "networkVolumes": [
@@ -233,8 +414,322 @@ def test_resolve_volume_datacenter_found(monkeypatch: pytest.MonkeyPatch) -> Non
 
 def test_resolve_volume_datacenter_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
-        runpod,
+        runpod_api,
         "get_user",
         lambda: {"networkVolumes": [{"id": "vol-abc", "dataCenterId": "US-TX-3"}]},
     )
     assert resolve_volume_datacenter("vol-unknown") is None
+
+
+def test_wait_for_ready_backs_off(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", lambda pod_id: {"id": pod_id})
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    monkeypatch.setattr(time, "monotonic", lambda: sum(sleeps))
+
+    with pytest.raises(PodTimeoutError):
+        wait_for_ready("pod-123", timeout=60)
+
+    assert sleeps[:3] == [0.5, 0.75, 1.125]
+    assert max(sleeps) == 10.0
+    # The final sleep is clamped so the total never overshoots the timeout
+    assert sum(sleeps) == pytest.approx(60)
+
+
+def test_wait_for_ready_fixed_poll_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", lambda pod_id: {"id": pod_id})
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    monkeypatch.setattr(time, "monotonic", lambda: sum(sleeps))
+
+    with pytest.raises(PodTimeoutError):
+        wait_for_ready("pod-123", timeout=10, poll_interval=2.0)
+
+    assert sleeps == [2.0] * 5
+
+
+def test_find_ollama_pods_filters_by_port(monkeypatch: pytest.MonkeyPatch) -> None:
+    pods = [
+        {"id": "ollama", "ports": "11434/tcp"},
+        {"id": "jupyter", "ports": "8888/http,22/tcp"},
+        {"id": "lookalike", "ports": "114340/tcp,211434/tcp"},
+        {"id": "spaced", "ports": "22/tcp, 11434/tcp"},
+        {"id": "http", "ports": "11434/http"},
+        {"id": "bad-suffix", "ports": "11434/tcp-x"},
+        {"id": "no-ports", "ports": None},
+    ]
+    monkeypatch.setattr(runpod_api, "get_pods", lambda: pods)
+
+    assert [p["id"] for p in find_ollama_pods()] == ["ollama", "spaced", "http"]
+
+
+def test_find_ollama_pods_uses_cache_until_invalidated(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    def get_pods() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        return [{"id": f"pod-{calls}", "ports": "11434/tcp"}]
+
+    monkeypatch.setattr(runpod_api, "get_pods", get_pods)
+    monkeypatch.setattr(runpod_api, "terminate_pod", lambda pod_id: None)
+
+    assert find_ollama_pods() == [{"id": "pod-1", "ports": "11434/tcp"}]
+    assert find_ollama_pods() == [{"id": "pod-1", "ports": "11434/tcp"}]
+    assert calls == 1
+
+    terminate_pod("pod-1")
+    assert find_ollama_pods() == [{"id": "pod-2", "ports": "11434/tcp"}]
+    assert calls == 2
+
+
+def test_async_wait_for_ready_backs_off(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    calls = 0
+
+    async def mock_get_pod(pod_id: str, **kwargs) -> dict:
+        nonlocal calls
+        calls += 1
+        return {"id": pod_id, "runtime": {"ports": []}} if calls >= 3 else {"id": pod_id}
+
+    async def mock_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(runpod_api, "async_get_pod_runtime", mock_get_pod)
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    pod = asyncio.run(async_wait_for_ready("pod-123", timeout=30))
+    assert pod["runtime"] is not None
+    assert sleeps == [0.5, 0.75]
+
+
+def test_async_terminate_pod_invalidates_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    terminated: list[str] = []
+
+    async def mock_terminate(pod_id: str, **kwargs) -> None:
+        terminated.append(pod_id)
+
+    monkeypatch.setattr(runpod_api, "async_terminate_pod", mock_terminate)
+    pod_module.POD_CACHE_FILE.write_text("[]")
+
+    asyncio.run(async_terminate_pod("pod-789"))
+    assert terminated == ["pod-789"]
+    assert not pod_module.POD_CACHE_FILE.exists()
+
+
+def test_resolve_volume_datacenter_fetches_user_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    def gql(query: str, variables: dict | None = None) -> dict:
+        nonlocal calls
+        calls += 1
+        return {"myself": {"networkVolumes": [{"id": "vol-abc", "dataCenterId": "US-TX-3"}]}}
+
+    monkeypatch.setattr(runpod_api, "get_user", _cached_get_user)
+    monkeypatch.setattr(runpod_api, "_gql", gql)
+
+    assert resolve_volume_datacenter("vol-abc") == "US-TX-3"
+    assert resolve_volume_datacenter("vol-missing") is None
+    assert calls == 1
+
+
+def test_resolve_volume_datacenter_sees_new_volume_after_cache_clear(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    volumes = [{"id": "vol-abc", "dataCenterId": "US-TX-3"}]
+    monkeypatch.setattr(runpod_api, "get_user", _cached_get_user)
+    monkeypatch.setattr(
+        runpod_api, "_gql", lambda query, variables=None: {"myself": {"networkVolumes": list(volumes)}}
+    )
+
+    assert resolve_volume_datacenter("vol-new") is None
+    volumes.append({"id": "vol-new", "dataCenterId": "EU-RO-1"})
+    assert resolve_volume_datacenter("vol-new") is None  # account record still cached
+
+    runpod_api.get_user.cache_clear()
+    assert resolve_volume_datacenter("vol-new") == "EU-RO-1"
+
+
+def test_async_pull_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    events = [{"status": "pulling manifest"}, {"status": "success"}]
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=_ndjson(events)))
+    seen: list[dict] = []
+
+    async def pull() -> None:
+        async with httpx.AsyncClient(transport=transport) as client:
+            await async_pull_model("http://1.2.3.4:30042", "qwen2.5:7b", on_progress=seen.append, client=client)
+
+    asyncio.run(pull())
+    assert seen == events
+
+
+def _pod_with_direct_port(pod_id: str, port: int = 30042) -> dict:
+    return {
+        "id": pod_id,
+        "runtime": {"ports": [{"ip": "127.0.0.1", "privatePort": 11434, "publicPort": port, "type": "tcp"}]},
+    }
+
+
+def test_wait_for_ready_probes_direct_port(monkeypatch: pytest.MonkeyPatch) -> None:
+    api_calls = 0
+    probes: list[tuple] = []
+
+    def mock_get_pod(pod_id: str) -> dict:
+        nonlocal api_calls
+        api_calls += 1
+        return _pod_with_direct_port(pod_id)
+
+    class _Conn:
+        def __enter__(self) -> "_Conn":
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            pass
+
+    def mock_connect(address: tuple, timeout: float) -> _Conn:
+        probes.append(address)
+        if len(probes) < 3:
+            raise ConnectionRefusedError
+        return _Conn()
+
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", mock_get_pod)
+    monkeypatch.setattr(pod_module.socket, "create_connection", mock_connect)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+
+    pod = wait_for_ready("pod-123", timeout=30)
+
+    assert pod["id"] == "pod-123"
+    assert api_calls == 1  # probing replaces API polling once the runtime is up
+    assert probes == [("127.0.0.1", 30042)] * 3
+
+
+def test_wait_for_ready_probes_on_short_interval_after_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    polls = 0
+    sleeps: list[float] = []
+
+    def mock_get_pod(pod_id: str) -> dict:
+        nonlocal polls
+        polls += 1
+        return _pod_with_direct_port(pod_id) if polls >= 10 else {"id": pod_id}
+
+    def refuse_twice(address: tuple, timeout: float) -> socket.socket:
+        if len(sleeps) < 11:
+            raise ConnectionRefusedError
+        return socket.socket()
+
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", mock_get_pod)
+    monkeypatch.setattr(pod_module.socket, "create_connection", refuse_twice)
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    wait_for_ready("pod-123", timeout=300)
+
+    assert sleeps[8] == pod_module.POLL_MAX_S  # API polls had backed off to the cap
+    assert sleeps[9:] == [pod_module.PROBE_INTERVAL_S] * 2
+
+
+def test_wait_for_ready_times_out_when_port_stays_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    def refuse(address: tuple, timeout: float) -> None:
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", lambda pod_id: _pod_with_direct_port(pod_id))
+    monkeypatch.setattr(pod_module.socket, "create_connection", refuse)
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+
+    with pytest.raises(PodTimeoutError):
+        wait_for_ready("pod-123", timeout=0)
+
+
+def test_wait_for_ready_clamps_probe_timeout_to_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    timeouts: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        nonlocal now
+        now += seconds
+
+    def refuse(address: tuple, timeout: float) -> None:
+        timeouts.append(timeout)
+        sleep(timeout)  # a refused probe that hangs for its full timeout
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(runpod_api, "get_pod_runtime", lambda pod_id: _pod_with_direct_port(pod_id))
+    monkeypatch.setattr(pod_module.socket, "create_connection", refuse)
+    monkeypatch.setattr(time, "sleep", sleep)
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    with pytest.raises(PodTimeoutError):
+        wait_for_ready("pod-123", timeout=3)
+
+    assert now == 1003.0  # the deadline, not a probe timeout past it
+    assert timeouts == [2.0, 0.5]
+
+
+def test_async_wait_for_ready_probes_direct_port(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def run() -> dict:
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def mock_get_pod(pod_id: str, *, client: object = None) -> dict:
+            return _pod_with_direct_port(pod_id, port)
+
+        monkeypatch.setattr(runpod_api, "async_get_pod_runtime", mock_get_pod)
+        async with server:
+            return await async_wait_for_ready("pod-123", timeout=5)
+
+    assert asyncio.run(run())["id"] == "pod-123"
+
+
+def test_terminate_pods_bounds_concurrency_and_reports_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    in_flight = peak = 0
+    terminated: list[str] = []
+
+    async def mock_terminate(pod_id: str, *, client: object = None) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if pod_id == "pod-bad":
+            raise QueryError("pod not found")
+        terminated.append(pod_id)
+
+    monkeypatch.setattr(runpod_api, "async_terminate_pod", mock_terminate)
+    pod_ids = [f"pod-{i}" for i in range(6)] + ["pod-bad"]
+
+    errors = asyncio.run(terminate_pods(pod_ids, max_concurrency=3))
+
+    assert sorted(terminated) == sorted(pod_ids[:-1])
+    assert list(errors) == ["pod-bad"]
+    assert isinstance(errors["pod-bad"], QueryError)
+    assert peak == 3
+
+
+def test_create_ollama_pod_lets_auth_errors_through(monkeypatch: pytest.MonkeyPatch) -> None:
+    def mock_create(**kwargs) -> dict:
+        raise AuthError("RunPod rejected the API key (401). Check RUNPOD_API_KEY.")
+
+    monkeypatch.setattr(runpod_api, "create_pod", mock_create)
+
+    with pytest.raises(AuthError):
+        create_ollama_pod("NVIDIA RTX A5000")
+
+
+def test_terminate_pods_reports_auth_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def mock_terminate(pod_id: str, *, client: object = None) -> None:
+        raise AuthError("RunPod rejected the API key (401). Check RUNPOD_API_KEY.")
+
+    monkeypatch.setattr(runpod_api, "async_terminate_pod", mock_terminate)
+
+    errors = terminate_pods_sync(["pod-1"])
+    assert isinstance(errors["pod-1"], AuthError)
+
+
+def test_terminate_pods_sync_invalidates_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def mock_terminate(pod_id: str, *, client: object = None) -> None:
+        pass
+
+    monkeypatch.setattr(runpod_api, "async_terminate_pod", mock_terminate)
+    pod_module.POD_CACHE_FILE.write_text("[]")
+
+    assert terminate_pods_sync(["pod-1", "pod-2"]) == {}
+    assert not pod_module.POD_CACHE_FILE.exists()
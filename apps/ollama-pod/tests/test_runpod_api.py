@@ -0,0 +1,185 @@
+import asyncio
+import json
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from ollama_pod import http_client, model_info, runpod_api
+from ollama_pod.config import runpod_api_key
+from ollama_pod.runpod_api import AuthError, QueryError
+
+
+@pytest.fixture(autouse=True)
+def _mock_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RUNPOD_API_KEY", "test-key")
+    runpod_api_key.cache_clear()
+    runpod_api._auth_headers.cache_clear()
+    runpod_api.get_user.cache_clear()
+    runpod_api.get_gpus.cache_clear()
+
+
+def test_gql_sends_bearer_auth(mock_client: Callable) -> None:
+    seen: dict = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["auth"] = request.headers["Authorization"]
+        return httpx.Response(200, json={"data": {"pod": {"id": "pod-1"}}})
+
+    bodies = mock_client(runpod_api, handler)
+
+    assert runpod_api.get_pod("pod-1") == {"id": "pod-1"}
+    assert seen == {"url": runpod_api.GRAPHQL_URL, "auth": "Bearer test-key"}
+    assert bodies[0]["variables"] == {"podId": "pod-1"}
+
+
+def test_gql_raises_query_error(mock_client: Callable) -> None:
+    mock_client(
+        runpod_api,
+        lambda request: httpx.Response(200, json={"errors": [{"message": "No resources available"}]}),
+    )
+    with pytest.raises(QueryError, match="No resources available"):
+        runpod_api.get_pods()
+
+
+def test_gql_unauthorized(mock_client: Callable) -> None:
+    mock_client(runpod_api, lambda request: httpx.Response(401, text="Unauthorized"))
+    with pytest.raises(AuthError, match="RUNPOD_API_KEY"):
+        runpod_api.get_pods()
+
+
+def test_get_pods_selects_list_fields_only(mock_client: Callable) -> None:
+    pods = [{"id": "pod-1", "ports": "11434/tcp"}]
+    bodies = mock_client(
+        runpod_api, lambda request: httpx.Response(200, json={"data": {"myself": {"pods": pods}}})
+    )
+
+    assert runpod_api.get_pods() == pods
+    assert "ports" in bodies[0]["query"]
+    assert "imageName" not in bodies[0]["query"]
+
+
+def test_get_pod_runtime_selects_runtime_only(mock_client: Callable) -> None:
+    pod = {"id": "pod-1", "runtime": None}
+    bodies = mock_client(runpod_api, lambda request: httpx.Response(200, json={"data": {"pod": pod}}))
+
+    assert runpod_api.get_pod_runtime("pod-1") == pod
+    assert bodies[0]["variables"] == {"podId": "pod-1"}
+    assert "runtime" in bodies[0]["query"]
+    assert "costPerHr" not in bodies[0]["query"]
+
+
+def test_create_pod_builds_deploy_input(mock_client: Callable) -> None:
+    bodies = mock_client(
+        runpod_api,
+        lambda request: httpx.Response(200, json={"data": {"podFindAndDeployOnDemand": {"id": "pod-9"}}}),
+    )
+    pod = runpod_api.create_pod(
+        name="ollama-default",
+        image_name="ollama/ollama",
+        gpu_type_id="NVIDIA RTX A5000",
+        cloud_type="SECURE",
+        ports="11434/tcp",
+        volume_in_gb=50,
+        env={"OLLAMA_KEEP_ALIVE": "24h"},
+    )
+
+    assert pod == {"id": "pod-9"}
+    pod_input = bodies[0]["variables"]["input"]
+    assert pod_input["gpuTypeId"] == "NVIDIA RTX A5000"
+    assert pod_input["cloudType"] == "SECURE"
+    assert pod_input["ports"] == "11434/tcp"
+    assert pod_input["volumeInGb"] == 50
+    assert pod_input["dataCenterId"] is None
+    assert pod_input["env"] == [{"key": "OLLAMA_KEEP_ALIVE", "value": "24h"}]
+    assert "networkVolumeId" not in pod_input
+
+
+def test_create_pod_with_volume_sends_given_datacenter(mock_client: Callable) -> None:
+    bodies = mock_client(
+        runpod_api,
+        lambda request: httpx.Response(200, json={"data": {"podFindAndDeployOnDemand": {"id": "pod-v"}}}),
+    )
+    runpod_api.create_pod(
+        name="ollama-default",
+        image_name="ollama/ollama",
+        gpu_type_id="NVIDIA RTX A5000",
+        network_volume_id="vol-abc",
+        data_center_id="EU-RO-1",
+    )
+
+    assert len(bodies) == 1  # no volume lookup of its own
+    pod_input = bodies[0]["variables"]["input"]
+    assert pod_input["networkVolumeId"] == "vol-abc"
+    assert pod_input["dataCenterId"] == "EU-RO-1"
+
+
+def test_async_get_pod_runtime(monkeypatch: pytest.MonkeyPatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer test-key"
+        assert json.loads(request.content)["variables"] == {"podId": "pod-1"}
+        return httpx.Response(200, json={"data": {"pod": {"id": "pod-1"}}})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(runpod_api, "new_async_client", lambda: httpx.AsyncClient(transport=transport))
+
+    assert asyncio.run(runpod_api.async_get_pod_runtime("pod-1")) == {"id": "pod-1"}
+
+
+def test_api_key_resolved_once_and_scoped_to_runpod(monkeypatch: pytest.MonkeyPatch) -> None:
+    reads = 0
+    real_require = runpod_api_key.__wrapped__
+
+    def counting_key() -> str:
+        nonlocal reads
+        reads += 1
+        return real_require()
+
+    monkeypatch.setattr("ollama_pod.config.runpod_api_key", counting_key)
+    registry_auth: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.runpod.io":
+            return httpx.Response(200, json={"data": {"pod": None}})
+        registry_auth.append(request.headers.get("Authorization"))
+        layer = {"mediaType": model_info.MODEL_MEDIA_TYPE, "size": 1024**3}
+        return httpx.Response(200, json={"layers": [layer]})
+
+    # One client shared by RunPod and registry calls, as in production
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(runpod_api, "get_client", lambda: client)
+    monkeypatch.setattr(model_info, "get_client", lambda: client)
+
+    runpod_api.get_pod("pod-1")
+    runpod_api.get_pod("pod-2")
+    model_info._fetch_model_size_gb("llama3:8b", "library/llama3", "8b")
+
+    assert reads == 1
+    # The key travels per request, never as a default on the shared client
+    assert registry_auth == [None]
+    assert "Authorization" not in http_client.get_client().headers
+
+
+def test_ttl_cache_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(runpod_api.time, "monotonic", lambda: now)
+    calls: list[str] = []
+
+    @runpod_api.ttl_cache(60)
+    def lookup(key: str) -> str:
+        calls.append(key)
+        return key.upper()
+
+    assert lookup("a") == "A"
+    assert lookup("a") == "A"
+    assert lookup("b") == "B"
+    assert calls == ["a", "b"]
+
+    now += 60
+    assert lookup("a") == "A"
+    assert calls == ["a", "b", "a"]
+
+    lookup.cache_clear()
+    lookup("b")
+    assert calls == ["a", "b", "a", "b"]